@@ -6,11 +6,13 @@ rate limits, and other tenant-specific configurations.
 """
 
 import logging
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Tuple, Union
 from uuid import UUID
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from datetime import datetime, timedelta
+from sqlalchemy import and_, or_, case, func
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from datetime import datetime, timedelta, timezone
 
 from ..models.database import TenantConfiguration, TenantRateLimit
 from ..schemas.tenant_configuration import (
@@ -39,6 +41,8 @@ class TenantConfigService:
     def __init__(self, db: Session):
         self.db = db
         self.secret_service = TenantSecretService(db)
+        # Request-scoped memo of get_config lookups, cleared on every write
+        self._config_cache: Dict[Tuple[UUID, str, Optional[str]], Optional[TenantConfigurationResponse]] = {}
     
     def list_tenant_configs(self, tenant_id: UUID) -> List[TenantConfigurationResponse]:
         """List all configurations for a tenant"""
@@ -50,6 +54,10 @@ class TenantConfigService:
     
     def get_config(self, tenant_id: UUID, config_type: str, environment: Optional[str] = None) -> Optional[TenantConfigurationResponse]:
         """Get specific configuration for a tenant"""
+        cache_key = (tenant_id, config_type, environment)
+        if cache_key in self._config_cache:
+            return self._config_cache[cache_key]
+        
         query = self.db.query(TenantConfiguration).filter(
             and_(
                 TenantConfiguration.tenant_id == tenant_id,
@@ -63,9 +71,9 @@ class TenantConfigService:
             query = query.filter(TenantConfiguration.environment == environment)
         
         config = query.first()
-        if config:
-            return TenantConfigurationResponse.from_orm(config)
-        return None
+        response = TenantConfigurationResponse.from_orm(config) if config else None
+        self._config_cache[cache_key] = response
+        return response
     
     def create_or_update_config(
         self, 
@@ -76,6 +84,7 @@ class TenantConfigService:
         environment: str = "development"
     ) -> TenantConfigurationResponse:
         """Create or update tenant configuration"""
+        self._config_cache.clear()
         
         # Check if configuration already exists
         existing_config = self.db.query(TenantConfiguration).filter(
@@ -131,6 +140,7 @@ class TenantConfigService:
     
     def delete_config(self, tenant_id: UUID, config_type: str) -> bool:
         """Delete tenant configuration"""
+        self._config_cache.clear()
         config = self.db.query(TenantConfiguration).filter(
             and_(
                 TenantConfiguration.tenant_id == tenant_id,
@@ -600,9 +610,6 @@ class RateLimitService:
     
     def check_rate_limit(self, tenant_id: UUID, limit_type: str, limit_value: int) -> bool:
         """Check if tenant has exceeded rate limit (operates on ORM entity)"""
-        from datetime import timezone
-        from sqlalchemy import and_
-        
         rl = self.db.query(TenantRateLimit).filter(
             and_(
                 TenantRateLimit.tenant_id == tenant_id,
@@ -646,7 +653,6 @@ class RateLimitService:
             rate_limit.current_usage += 1  # Fixed: use current_usage instead of current_count
         else:
             # Create new rate limit record with tenant's configured limit value
-            from datetime import timezone
             now = datetime.now(timezone.utc)
             window_duration = self._get_window_duration(limit_type)
             rate_limit = TenantRateLimit(
@@ -661,10 +667,58 @@ class RateLimitService:
         
         self.db.commit()
     
+    def check_and_increment(self, tenant_id: UUID, limit_type: str, limit_value: int) -> bool:
+        """
+        Check the rate limit and, if allowed, count the request in a single statement.
+        
+        Equivalent to check_rate_limit() followed by increment_rate_limit(), but issued
+        as one INSERT ... ON CONFLICT DO UPDATE so the check and the increment take a
+        single round-trip and cannot race. Relies on the unique (tenant_id, limit_type)
+        constraint on tenant_rate_limits.
+        
+        Args:
+            tenant_id: UUID of the tenant
+            limit_type: Type of rate limit (e.g., 'api_requests_per_minute')
+            limit_value: The configured limit value for this tenant and limit type
+        
+        Returns:
+            True if the request is allowed and was counted, False if the limit is reached
+        """
+        now = datetime.now(timezone.utc)
+        window_duration = self._get_window_duration(limit_type)
+        window_expired = TenantRateLimit.window_start < now - window_duration
+        
+        dialect = self.db.get_bind().dialect.name
+        insert = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}.get(dialect)
+        if insert is None:
+            raise ValueError(f"Unsupported database dialect for check_and_increment: {dialect}")
+        stmt = insert(TenantRateLimit).values(
+            tenant_id=tenant_id,
+            limit_type=limit_type,
+            limit_value=limit_value,  # Use actual configured limit for the tenant
+            current_usage=1,
+            window_start=now,
+            window_end=now + window_duration
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TenantRateLimit.tenant_id, TenantRateLimit.limit_type],
+            set_={
+                "current_usage": case((window_expired, 1), else_=TenantRateLimit.current_usage + 1),
+                "window_start": case((window_expired, now), else_=TenantRateLimit.window_start),
+                "window_end": case((window_expired, now + window_duration), else_=TenantRateLimit.window_end),
+                "updated_at": func.now()
+            },
+            # Rows at their limit are left untouched and return nothing
+            where=or_(window_expired, TenantRateLimit.current_usage < limit_value)
+        ).returning(TenantRateLimit)
+        
+        rate_limit = self.db.scalars(stmt, execution_options={"populate_existing": True}).first()
+        self.db.commit()
+        return rate_limit is not None
+    
     def reset_rate_limits(self, tenant_id: UUID) -> bool:
         """Reset all rate limits for tenant"""
         try:
-            from datetime import timezone
             rate_limits = self.db.query(TenantRateLimit).filter(
                 TenantRateLimit.tenant_id == tenant_id
             ).all()
@@ -0,0 +1,19 @@
+"""
+Shared helpers for backend tests
+"""
+
+import itertools
+from datetime import datetime, timezone
+from uuid import UUID
+
+
+_uuid_counter = itertools.count(1)
+
+# Fixed clock for test timestamps, formatted once for response comparisons
+FROZEN_NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+FROZEN_NOW_ISO = FROZEN_NOW.isoformat()
+
+
+def fake_uuid():
+    """Distinct, deterministic UUID for test records (no os.urandom call)"""
+    return UUID(int=next(_uuid_counter))
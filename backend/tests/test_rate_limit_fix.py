@@ -5,39 +5,166 @@ Tests that rate limit records use actual tenant-configured limit values
 Includes both unit tests (with mocks) and integration tests (with real service instances)
 """
 
+import inspect
+import itertools
+import sys
 import pytest
-import uuid
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from unittest.mock import Mock, MagicMock, patch
+from typing import NamedTuple
+from unittest.mock import patch
 from uuid import UUID
-from sqlalchemy import create_engine
+from sqlalchemy import (
+    JSON, CheckConstraint, Column, DateTime, ForeignKey, MetaData, Table, UniqueConstraint, Uuid,
+    create_engine, event, insert
+)
+from sqlalchemy.dialects.postgresql import JSONB, UUID as PostgresUUID
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.pool import StaticPool
 
+from src.models.database import Tenant, TenantConfiguration, TenantRateLimit
+from src.services.tenant_config_service import RateLimitService, TenantConfigService
+
+from helpers import FROZEN_NOW, fake_uuid
+
+
+_ONE_MINUTE = timedelta(minutes=1)
+_TWO_MINUTES = timedelta(minutes=2)
+_ONE_HOUR = timedelta(hours=1)
+
+
+def _utcnow():
+    """Current UTC time; patched by the frozen_now fixture"""
+    return datetime.now(timezone.utc)
+
+
+@pytest.fixture
+def frozen_now(monkeypatch):
+    """Freeze _utcnow so window arithmetic does not depend on the system clock"""
+    monkeypatch.setattr(sys.modules[__name__], "_utcnow", lambda: FROZEN_NOW)
+    return FROZEN_NOW
+
 
 class MockTenantRateLimit:
     """Mock TenantRateLimit object for testing"""
-    def __init__(self, tenant_id, limit_type, limit_value, current_usage=0, window_start=None, window_end=None):
-        self.id = uuid.uuid4()
+    __slots__ = ("id", "tenant_id", "limit_type", "limit_value", "current_usage",
+                 "window_start", "window_end", "created_at", "updated_at")
+
+    def __init__(self, tenant_id, limit_type, limit_value, current_usage=0,
+                 window_start=FROZEN_NOW, window_end=FROZEN_NOW + _ONE_HOUR):
+        self._reset(tenant_id, limit_type, limit_value, current_usage, window_start, window_end)
+
+    def _reset(self, tenant_id, limit_type, limit_value, current_usage, window_start, window_end):
+        self.id = fake_uuid()  # A recycled instance must not keep an earlier test's identity
         self.tenant_id = tenant_id
         self.limit_type = limit_type
         self.limit_value = limit_value
         self.current_usage = current_usage
-        self.window_start = window_start or datetime.now(timezone.utc)
-        self.window_end = window_end or (datetime.now(timezone.utc) + timedelta(hours=1))
-        self.created_at = datetime.now(timezone.utc)
-        self.updated_at = datetime.now(timezone.utc)
+        self.window_start = window_start
+        self.window_end = window_end
+        self.created_at = self.updated_at = FROZEN_NOW
+
+    @classmethod
+    def acquire(cls, tenant_id, limit_type, limit_value, current_usage=0,
+                window_start=FROZEN_NOW, window_end=FROZEN_NOW + _ONE_HOUR):
+        """Reuse a recycled instance if available, overwriting its id and fields in place"""
+        if not _MOCK_POOL:
+            return cls(tenant_id, limit_type, limit_value, current_usage, window_start, window_end)
+        rate_limit = _MOCK_POOL.pop()
+        rate_limit._reset(tenant_id, limit_type, limit_value, current_usage, window_start, window_end)
+        return rate_limit
+
+    def recycle(self):
+        """Return this instance to the pool for a later acquire()"""
+        _MOCK_POOL.append(self)
+
+_MOCK_POOL: list[MockTenantRateLimit] = []
+
+
+@pytest.fixture
+def acquire_rate_limit():
+    """Acquire pooled MockTenantRateLimit instances that are recycled after the test"""
+    acquired = []
 
+    def acquire(**kwargs):
+        rate_limit = MockTenantRateLimit.acquire(**kwargs)
+        acquired.append(rate_limit)
+        return rate_limit
 
+    yield acquire
+    for rate_limit in acquired:
+        rate_limit.recycle()
+
+
+class MockTenantRateLimitRO(NamedTuple):
+    """Immutable TenantRateLimit snapshot for tests that only read fields"""
+    id: UUID
+    tenant_id: UUID
+    limit_type: str
+    limit_value: int
+    current_usage: int
+    window_start: datetime
+    window_end: datetime
+    created_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def build(cls, tenant_id, limit_type, limit_value, current_usage=0,
+              window_start=FROZEN_NOW, window_end=FROZEN_NOW + _ONE_HOUR):
+        """Build a snapshot with the same defaults as MockTenantRateLimit"""
+        return cls(
+            id=fake_uuid(),
+            tenant_id=tenant_id,
+            limit_type=limit_type,
+            limit_value=limit_value,
+            current_usage=current_usage,
+            window_start=window_start,
+            window_end=window_end,
+            created_at=FROZEN_NOW,
+            updated_at=FROZEN_NOW
+        )
+
+
+# Signature of the real service method, inspected once for the signature tests
+_INCREMENT_SIGNATURE = inspect.signature(RateLimitService.increment_rate_limit)
+
+
+@dataclass(frozen=True, slots=True)
 class MockRateLimitsConfig:
     """Mock RateLimitsConfig object for testing"""
-    def __init__(self, **kwargs):
-        self.api_requests_per_minute = kwargs.get('api_requests_per_minute', 100)
-        self.api_requests_per_hour = kwargs.get('api_requests_per_hour', 1000)
-        self.document_uploads_per_hour = kwargs.get('document_uploads_per_hour', 50)
-        self.extractions_per_hour = kwargs.get('extractions_per_hour', 20)
-        self.max_concurrent_extractions = kwargs.get('max_concurrent_extractions', 3)
-        self.burst_limit = kwargs.get('burst_limit', 10)
+    api_requests_per_minute: int = 100
+    api_requests_per_hour: int = 1000
+    document_uploads_per_hour: int = 50
+    extractions_per_hour: int = 20
+    max_concurrent_extractions: int = 3
+    burst_limit: int = 10
+
+
+# Default configuration, shared by tests that never modify it
+_DEFAULT_CONFIG = MockRateLimitsConfig()
+
+
+# Custom tenant configuration
+_CUSTOM_RATE_LIMITS = MockRateLimitsConfig(
+    api_requests_per_minute=200,  # Custom value
+    api_requests_per_hour=5000,   # Custom value
+    extractions_per_hour=50,      # Custom value
+    document_uploads_per_hour=100 # Custom value
+)
+
+
+@pytest.fixture(scope="module")
+def tenant_limits_config():
+    """Read-only tenant configuration shared by the tests in this module"""
+    return MockRateLimitsConfig(
+        api_requests_per_minute=250,
+        api_requests_per_hour=5000,
+        document_uploads_per_hour=100,
+        extractions_per_hour=75,
+        max_concurrent_extractions=5,
+        burst_limit=20
+    )
 
 
 class TestRateLimitValueFix:
@@ -45,12 +172,12 @@ class TestRateLimitValueFix:
 
     def test_increment_creates_record_with_configured_limit(self):
         """Test that new rate limit record uses actual configured limit value"""
-        tenant_id = uuid.uuid4()
+        tenant_id = fake_uuid()
         limit_type = "api_requests_per_minute"
         configured_limit = 150  # Tenant's custom limit (not default 100 or hardcoded 1000)
         
         # Simulate creating a new rate limit record
-        rate_limit = MockTenantRateLimit(
+        rate_limit = MockTenantRateLimitRO.build(
             tenant_id=tenant_id,
             limit_type=limit_type,
             limit_value=configured_limit,
@@ -64,41 +191,30 @@ class TestRateLimitValueFix:
             "limit_value should not be hardcoded to 1000"
         assert rate_limit.current_usage == 1
 
-    def test_increment_with_different_limit_types(self):
+    @pytest.mark.parametrize("limit_type,expected_value", [
+        ("api_requests_per_minute", 200),
+        ("api_requests_per_hour", 5000),
+        ("extractions_per_hour", 50),
+        ("document_uploads_per_hour", 100),
+    ])
+    def test_increment_with_different_limit_types(self, limit_type, expected_value):
         """Test that different limit types use their respective configured values"""
-        tenant_id = uuid.uuid4()
-        
-        # Custom tenant configuration
-        rate_limits_config = MockRateLimitsConfig(
-            api_requests_per_minute=200,  # Custom value
-            api_requests_per_hour=5000,   # Custom value
-            extractions_per_hour=50,      # Custom value
-            document_uploads_per_hour=100 # Custom value
+        configured_value = getattr(_CUSTOM_RATE_LIMITS, limit_type)
+        rate_limit = MockTenantRateLimitRO.build(
+            tenant_id=fake_uuid(),
+            limit_type=limit_type,
+            limit_value=configured_value,
+            current_usage=1
         )
         
-        test_cases = [
-            ("api_requests_per_minute", rate_limits_config.api_requests_per_minute, 200),
-            ("api_requests_per_hour", rate_limits_config.api_requests_per_hour, 5000),
-            ("extractions_per_hour", rate_limits_config.extractions_per_hour, 50),
-            ("document_uploads_per_hour", rate_limits_config.document_uploads_per_hour, 100),
-        ]
-        
-        for limit_type, configured_value, expected_value in test_cases:
-            rate_limit = MockTenantRateLimit(
-                tenant_id=tenant_id,
-                limit_type=limit_type,
-                limit_value=configured_value,
-                current_usage=1
-            )
-            
-            assert rate_limit.limit_value == expected_value, \
-                f"For {limit_type}, expected {expected_value}, got {rate_limit.limit_value}"
-            assert rate_limit.limit_value != 1000, \
-                f"For {limit_type}, should not use hardcoded 1000"
+        assert rate_limit.limit_value == expected_value, \
+            f"For {limit_type}, expected {expected_value}, got {rate_limit.limit_value}"
+        assert rate_limit.limit_value != 1000, \
+            f"For {limit_type}, should not use hardcoded 1000"
 
     def test_increment_with_default_fallback(self):
         """Test that default value is used when no configuration exists"""
-        tenant_id = uuid.uuid4()
+        tenant_id = fake_uuid()
         limit_type = "extractions_per_hour"
         
         # Simulate case where no rate limits config exists
@@ -110,7 +226,7 @@ class TestRateLimitValueFix:
         if not rate_limits_config:
             limit_value = default_value
         
-        rate_limit = MockTenantRateLimit(
+        rate_limit = MockTenantRateLimitRO.build(
             tenant_id=tenant_id,
             limit_type=limit_type,
             limit_value=limit_value,
@@ -120,14 +236,14 @@ class TestRateLimitValueFix:
         assert rate_limit.limit_value == default_value, \
             f"Expected default value {default_value}, got {rate_limit.limit_value}"
 
-    def test_increment_preserves_limit_on_update(self):
+    def test_increment_preserves_limit_on_update(self, acquire_rate_limit):
         """Test that incrementing existing record preserves the limit_value"""
-        tenant_id = uuid.uuid4()
+        tenant_id = fake_uuid()
         limit_type = "api_requests_per_minute"
         configured_limit = 150
         
         # Create existing rate limit record
-        rate_limit = MockTenantRateLimit(
+        rate_limit = acquire_rate_limit(
             tenant_id=tenant_id,
             limit_type=limit_type,
             limit_value=configured_limit,
@@ -143,13 +259,11 @@ class TestRateLimitValueFix:
         assert rate_limit.current_usage == 6, \
             "current_usage should be incremented"
 
-    def test_middleware_passes_limit_value(self):
+    def test_middleware_passes_limit_value(self, tenant_limits_config):
         """Test that middleware passes the configured limit_value to increment_rate_limit"""
-        tenant_id = uuid.uuid4()
+        tenant_id = fake_uuid()
         limit_type = "api_requests_per_minute"
-        
-        # Mock rate limits config with custom value
-        rate_limits_config = MockRateLimitsConfig(api_requests_per_minute=250)
+        rate_limits_config = tenant_limits_config
         
         # Get the configured limit value (simulating middleware behavior)
         limit_value = getattr(rate_limits_config, limit_type)
@@ -168,13 +282,11 @@ class TestRateLimitValueFix:
         assert rate_limit_service_call['limit_value'] == 250, \
             "Correct limit_value should be passed"
 
-    def test_extraction_service_passes_limit_value(self):
+    def test_extraction_service_passes_limit_value(self, tenant_limits_config):
         """Test that extraction service passes the configured limit_value"""
-        tenant_id = uuid.uuid4()
+        tenant_id = fake_uuid()
         limit_type = "extractions_per_hour"
-        
-        # Mock rate limits config with custom value
-        rate_limits_config = MockRateLimitsConfig(extractions_per_hour=75)
+        rate_limits_config = tenant_limits_config
         
         # Simulate extraction service behavior
         if rate_limits_config:
@@ -198,13 +310,13 @@ class TestRateLimitValueFix:
 
     def test_multiple_tenants_with_different_limits(self):
         """Test that different tenants can have different configured limits"""
-        tenant1_id = uuid.uuid4()
-        tenant2_id = uuid.uuid4()
+        tenant1_id = fake_uuid()
+        tenant2_id = fake_uuid()
         limit_type = "api_requests_per_minute"
         
         # Tenant 1 has high limit
         tenant1_limit = 500
-        rate_limit1 = MockTenantRateLimit(
+        rate_limit1 = MockTenantRateLimitRO.build(
             tenant_id=tenant1_id,
             limit_type=limit_type,
             limit_value=tenant1_limit,
@@ -213,7 +325,7 @@ class TestRateLimitValueFix:
         
         # Tenant 2 has low limit
         tenant2_limit = 50
-        rate_limit2 = MockTenantRateLimit(
+        rate_limit2 = MockTenantRateLimitRO.build(
             tenant_id=tenant2_id,
             limit_type=limit_type,
             limit_value=tenant2_limit,
@@ -232,126 +344,36 @@ class TestRateLimitValueFix:
 
     def test_increment_rate_limit_signature(self):
         """Test that the actual RateLimitService.increment_rate_limit accepts limit_value parameter"""
-        import inspect
-        import ast
-        from pathlib import Path
-        
-        # Read the source file directly without importing (to avoid database connection)
-        service_file = Path(__file__).parent.parent / 'src' / 'services' / 'tenant_config_service.py'
-        source_code = service_file.read_text()
-        
-        # Parse the source code
-        tree = ast.parse(source_code)
-        
-        # Find the RateLimitService class and increment_rate_limit method
-        rate_limit_service = None
-        increment_method = None
-        
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ClassDef) and node.name == 'RateLimitService':
-                rate_limit_service = node
-                for item in node.body:
-                    if isinstance(item, ast.FunctionDef) and item.name == 'increment_rate_limit':
-                        increment_method = item
-                        break
-                break
-        
-        assert rate_limit_service is not None, "RateLimitService class should exist"
-        assert increment_method is not None, "increment_rate_limit method should exist"
-        
-        # Extract parameter names and defaults
-        args = increment_method.args
-        param_names = [arg.arg for arg in args.args]
+        params = _INCREMENT_SIGNATURE.parameters
         
         # Verify required parameters exist
-        assert 'self' in param_names, "Method should have self parameter"
-        assert 'tenant_id' in param_names, "Method should accept tenant_id parameter"
-        assert 'limit_type' in param_names, "Method should accept limit_type parameter"
-        assert 'limit_value' in param_names, "Method should accept limit_value parameter"
-        
-        # Verify limit_value has a default value
-        # defaults are stored in reverse order from the end of args
-        limit_value_idx = param_names.index('limit_value')
-        num_defaults = len(args.defaults)
-        num_params = len(param_names)
-        
-        # Check if limit_value has a default (it should be in the defaults list)
-        has_default = (num_params - limit_value_idx) <= num_defaults
-        assert has_default, "limit_value should have a default value"
-        
-        # Get the default value for limit_value
-        default_idx = num_defaults - (num_params - limit_value_idx)
-        default_value_node = args.defaults[default_idx]
+        assert 'self' in params, "Method should have self parameter"
+        assert 'tenant_id' in params, "Method should accept tenant_id parameter"
+        assert 'limit_type' in params, "Method should accept limit_type parameter"
+        assert 'limit_value' in params, "Method should accept limit_value parameter"
         
         # Verify the default value is 1000
-        assert isinstance(default_value_node, ast.Constant), "Default should be a constant"
-        assert default_value_node.value == 1000, "limit_value default should be 1000 for backward compatibility"
+        assert params['limit_value'].default == 1000, \
+            "limit_value default should be 1000 for backward compatibility"
 
     def test_backward_compatibility_default_parameter(self):
         """Test that the actual method signature maintains backward compatibility with default parameter"""
-        import ast
-        from pathlib import Path
-        
-        # Read the source file directly without importing (to avoid database connection)
-        service_file = Path(__file__).parent.parent / 'src' / 'services' / 'tenant_config_service.py'
-        source_code = service_file.read_text()
-        
-        # Parse the source code
-        tree = ast.parse(source_code)
-        
-        # Find the RateLimitService class and increment_rate_limit method
-        increment_method = None
-        
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ClassDef) and node.name == 'RateLimitService':
-                for item in node.body:
-                    if isinstance(item, ast.FunctionDef) and item.name == 'increment_rate_limit':
-                        increment_method = item
-                        break
-                break
-        
-        assert increment_method is not None, "increment_rate_limit method should exist"
-        
-        # Extract parameters
-        args = increment_method.args
-        param_names = [arg.arg for arg in args.args]
-        
-        # Find index of limit_type
-        assert 'limit_type' in param_names, "limit_type parameter should exist"
-        limit_type_idx = param_names.index('limit_type')
-        
-        # All parameters after limit_type should have defaults (for backward compatibility)
-        num_params = len(param_names)
-        num_defaults = len(args.defaults)
-        
-        # Parameters with defaults start at index: num_params - num_defaults
-        first_default_idx = num_params - num_defaults
+        param_names = list(_INCREMENT_SIGNATURE.parameters)
         
         # All parameters after limit_type should have defaults
-        for idx in range(limit_type_idx + 1, num_params):
-            assert idx >= first_default_idx, \
-                f"Parameter '{param_names[idx]}' after 'limit_type' should have a default value for backward compatibility"
-        
-        # Specifically verify limit_value exists and has default of 1000
-        assert 'limit_value' in param_names, "limit_value parameter should exist"
-        limit_value_idx = param_names.index('limit_value')
-        
-        # Get the default value for limit_value
-        default_idx = num_defaults - (num_params - limit_value_idx)
-        default_value_node = args.defaults[default_idx]
-        
-        assert isinstance(default_value_node, ast.Constant), "Default should be a constant"
-        assert default_value_node.value == 1000, \
-            "limit_value should default to 1000 for backward compatibility"
+        assert 'limit_type' in param_names, "limit_type parameter should exist"
+        for name in param_names[param_names.index('limit_type') + 1:]:
+            assert _INCREMENT_SIGNATURE.parameters[name].default is not inspect.Parameter.empty, \
+                f"Parameter '{name}' after 'limit_type' should have a default value for backward compatibility"
 
-    def test_check_rate_limit_uses_stored_limit(self):
+    def test_check_rate_limit_uses_stored_limit(self, acquire_rate_limit):
         """Test that check_rate_limit compares against the correct limit value"""
-        tenant_id = uuid.uuid4()
+        tenant_id = fake_uuid()
         limit_type = "api_requests_per_minute"
         configured_limit = 150
         
         # Create rate limit record
-        rate_limit = MockTenantRateLimit(
+        rate_limit = acquire_rate_limit(
             tenant_id=tenant_id,
             limit_type=limit_type,
             limit_value=configured_limit,
@@ -370,26 +392,26 @@ class TestRateLimitValueFix:
         is_allowed = rate_limit.current_usage < limit_value_from_config
         assert not is_allowed, "Should not be allowed (150 >= 150)"
 
-    def test_rate_limit_window_reset(self):
+    def test_rate_limit_window_reset(self, acquire_rate_limit, frozen_now):
         """Test that rate limit window reset maintains correct limit_value"""
-        tenant_id = uuid.uuid4()
+        tenant_id = fake_uuid()
         limit_type = "api_requests_per_minute"
         configured_limit = 150
         
         # Create rate limit record with expired window
-        old_window_start = datetime.now(timezone.utc) - timedelta(minutes=2)
-        rate_limit = MockTenantRateLimit(
+        old_window_start = frozen_now - _TWO_MINUTES
+        rate_limit = acquire_rate_limit(
             tenant_id=tenant_id,
             limit_type=limit_type,
             limit_value=configured_limit,
             current_usage=100,
             window_start=old_window_start,
-            window_end=old_window_start + timedelta(minutes=1)
+            window_end=old_window_start + _ONE_MINUTE
         )
         
         # Simulate window reset
-        now = datetime.now(timezone.utc)
-        window_duration = timedelta(minutes=1)
+        now = _utcnow()
+        window_duration = _ONE_MINUTE
         
         if now - rate_limit.window_start > window_duration:
             rate_limit.current_usage = 0
@@ -402,14 +424,14 @@ class TestRateLimitValueFix:
         assert rate_limit.current_usage == 0, \
             "current_usage should be reset to 0"
 
-    def test_consistency_between_check_and_increment(self):
+    def test_consistency_between_check_and_increment(self, tenant_limits_config):
         """Test that check_rate_limit and increment_rate_limit use same limit value"""
-        tenant_id = uuid.uuid4()
+        tenant_id = fake_uuid()
         limit_type = "api_requests_per_minute"
-        configured_limit = 150
+        configured_limit = 250
         
         # Both operations should use the same configured limit
-        rate_limits_config = MockRateLimitsConfig(api_requests_per_minute=configured_limit)
+        rate_limits_config = tenant_limits_config
         
         # check_rate_limit should use this value
         check_limit = rate_limits_config.api_requests_per_minute
@@ -426,11 +448,11 @@ class TestRateLimitEdgeCases:
 
     def test_zero_limit_value(self):
         """Test handling of zero limit value"""
-        tenant_id = uuid.uuid4()
+        tenant_id = fake_uuid()
         limit_type = "api_requests_per_minute"
         
         # Edge case: tenant has 0 limit (rate limiting disabled)
-        rate_limit = MockTenantRateLimit(
+        rate_limit = MockTenantRateLimitRO.build(
             tenant_id=tenant_id,
             limit_type=limit_type,
             limit_value=0,
@@ -441,12 +463,12 @@ class TestRateLimitEdgeCases:
 
     def test_very_high_limit_value(self):
         """Test handling of very high limit values"""
-        tenant_id = uuid.uuid4()
+        tenant_id = fake_uuid()
         limit_type = "api_requests_per_minute"
         
         # Edge case: tenant has very high limit
         high_limit = 1000000
-        rate_limit = MockTenantRateLimit(
+        rate_limit = MockTenantRateLimitRO.build(
             tenant_id=tenant_id,
             limit_type=limit_type,
             limit_value=high_limit,
@@ -460,11 +482,11 @@ class TestRateLimitEdgeCases:
 
     def test_missing_config_attribute(self):
         """Test handling when rate limits config doesn't have the requested attribute"""
-        tenant_id = uuid.uuid4()
+        tenant_id = fake_uuid()
         limit_type = "custom_limit_per_hour"
         
         # Config doesn't have custom_limit_per_hour attribute
-        rate_limits_config = MockRateLimitsConfig()
+        rate_limits_config = _DEFAULT_CONFIG
         
         # Should use default or fallback gracefully
         limit_value = getattr(rate_limits_config, limit_type, 1000)
@@ -477,27 +499,14 @@ class TestRateLimitDocumentation:
     """Test that rate limit methods have proper documentation"""
 
     def test_increment_rate_limit_docstring(self):
-        """Test that increment_rate_limit has proper documentation"""
-        def increment_rate_limit(tenant_id: UUID, limit_type: str, limit_value: int = 1000) -> None:
-            """
-            Increment rate limit counter.
-            
-            Args:
-                tenant_id: UUID of the tenant
-                limit_type: Type of rate limit (e.g., 'api_requests_per_minute')
-                limit_value: The configured limit value for this tenant and limit type.
-                            Used when creating a new rate limit record. Defaults to 1000
-                            for backward compatibility, but should always be provided
-                            based on tenant configuration.
-            """
-            pass
-        
-        # Verify docstring exists and contains important information
-        assert increment_rate_limit.__doc__ is not None, \
-            "Method should have docstring"
-        assert "limit_value" in increment_rate_limit.__doc__, \
-            "Docstring should document limit_value parameter"
-        assert "configured limit" in increment_rate_limit.__doc__, \
+        """Test that the real increment_rate_limit documents every parameter"""
+        docstring = inspect.getdoc(RateLimitService.increment_rate_limit)
+        
+        assert docstring is not None, "Method should have docstring"
+        for name in _INCREMENT_SIGNATURE.parameters:
+            if name != "self":
+                assert f"{name}:" in docstring, f"Docstring should document {name} parameter"
+        assert "configured limit" in docstring, \
             "Docstring should explain that it uses configured limit"
 
 
@@ -509,18 +518,215 @@ if __name__ == "__main__":
 # INTEGRATION TESTS WITH REAL SERVICE INSTANCES
 # ============================================================================
 
-class TestRateLimitServiceIntegration:
+def _sqlite_type(column_type):
+    """Generic equivalent of a PostgreSQL-only column type, for SQLite DDL"""
+    if isinstance(column_type, PostgresUUID):
+        return Uuid()
+    if isinstance(column_type, JSONB):
+        return JSON()
+    return column_type
+
+
+def _sqlite_metadata(*models):
     """
-    Integration tests that use real RateLimitService with in-memory SQLite database.
-    These tests verify the actual implementation behavior, not just mocks.
+    SQLite-compatible copies of the given models' tables.
+    
+    The full schema does not build on SQLite (PostgreSQL UUID/JSONB types, DEFERRABLE
+    unique constraints, regex CHECKs on unrelated tables), so this copies only the
+    tables a test needs: UUID/JSONB columns become their generic types and unique
+    constraints drop DEFERRABLE. Foreign keys, plain CHECKs and the unique
+    (tenant_id, limit_type) constraint that check_and_increment's ON CONFLICT
+    targets are kept.
+    """
+    metadata = MetaData()
+    for model in models:
+        source = model.__table__
+        columns = [
+            Column(
+                column.name,
+                _sqlite_type(column.type),
+                *(ForeignKey(fk.target_fullname, ondelete=fk.ondelete) for fk in column.foreign_keys),
+                primary_key=column.primary_key,
+                nullable=column.nullable,
+                server_default=column.server_default.arg if column.server_default is not None else None
+            )
+            for column in source.columns
+        ]
+        constraints = [
+            UniqueConstraint(*constraint.columns.keys(), name=constraint.name)
+            if isinstance(constraint, UniqueConstraint)
+            else CheckConstraint(constraint.sqltext, name=constraint.name)
+            for constraint in source.constraints
+            if isinstance(constraint, (UniqueConstraint, CheckConstraint))
+        ]
+        Table(source.name, metadata, *columns, *constraints)
+    return metadata
+
+
+def _restore_utc(target, *args):
+    """Mark naive datetimes loaded from SQLite as UTC, as PostgreSQL's timestamptz would return them"""
+    for column in target.__table__.columns:
+        value = target.__dict__.get(column.key)  # Only loaded attributes; never trigger a load here
+        if isinstance(column.type, DateTime) and column.type.timezone and value and value.tzinfo is None:
+            set_committed_value(target, column.key, value.replace(tzinfo=timezone.utc))
+
+
+# (limit type, limit, requests over the limit) grid for check_and_increment
+_LIMIT_CASES = list(itertools.product(
+    ("api_requests_per_minute", "extractions_per_hour"),
+    (1, 20, 250),
+    (1, 5)
+))
+
+
+class TestCheckAndIncrement:
+    """
+    Tests for RateLimitService.check_and_increment against a real SQLite database
+    holding only the tenant_rate_limits table.
     """
     
     @pytest.fixture
     def db_session(self):
-        """Create an in-memory SQLite database for testing"""
-        # Import models here to avoid circular imports
-        from src.models.database import Base, Tenant, TenantConfiguration, TenantRateLimit
+        """Create a session on a fresh in-memory database with just tenant_rate_limits"""
+        engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+        _sqlite_metadata(Tenant, TenantRateLimit).create_all(engine)
+        session = Session(bind=engine)
+        
+        yield session
+        
+        session.close()
+        engine.dispose()
+    
+    @pytest.fixture
+    def rate_limit_service(self, db_session: Session):
+        """Create RateLimitService instance with test database"""
+        return RateLimitService(db_session)
+    
+    @staticmethod
+    def _seed(db_session, tenant_id, limit_type, limit_value, current_usage, window_start):
+        """Insert an existing rate limit record with the given usage and window"""
+        window = RateLimitService(db_session)._get_window_duration(limit_type)
+        db_session.execute(insert(TenantRateLimit).values(
+            tenant_id=tenant_id,
+            limit_type=limit_type,
+            limit_value=limit_value,
+            current_usage=current_usage,
+            window_start=window_start,
+            window_end=window_start + window
+        ))
+        db_session.commit()
+    
+    @staticmethod
+    def _get(db_session, tenant_id, limit_type):
+        """Load the rate limit record for a tenant and limit type"""
+        return db_session.query(TenantRateLimit).filter(
+            TenantRateLimit.tenant_id == tenant_id,
+            TenantRateLimit.limit_type == limit_type
+        ).one()
+    
+    def test_first_request_creates_record_with_configured_limit(self, db_session, rate_limit_service):
+        """Test that the insert path creates the record with the configured limit and usage 1"""
+        tenant_id = fake_uuid()
+        
+        allowed = rate_limit_service.check_and_increment(tenant_id, "api_requests_per_minute", 150)
+        
+        rate_limit = self._get(db_session, tenant_id, "api_requests_per_minute")
+        assert allowed is True, "First request should be allowed"
+        assert rate_limit.limit_value == 150, "Should use the configured limit, not hardcoded 1000"
+        assert rate_limit.current_usage == 1
+        assert rate_limit.window_end - rate_limit.window_start == _ONE_MINUTE, \
+            "Window length should follow the limit type"
+    
+    def test_request_at_limit_is_blocked_without_counting(self, db_session, rate_limit_service):
+        """Test that a record at its limit in the current window is left untouched"""
+        tenant_id = fake_uuid()
+        self._seed(db_session, tenant_id, "extractions_per_hour", 75, 75, datetime.now(timezone.utc))
+        
+        allowed = rate_limit_service.check_and_increment(tenant_id, "extractions_per_hour", 75)
+        
+        assert allowed is False, "Request at the limit should be blocked"
+        assert self._get(db_session, tenant_id, "extractions_per_hour").current_usage == 75, \
+            "Blocked request should not be counted"
+    
+    def test_expired_window_is_reset(self, db_session, rate_limit_service):
+        """Test that a full record whose window has expired starts a new window at usage 1"""
+        tenant_id = fake_uuid()
+        old_window_start = datetime.now(timezone.utc) - 2 * _ONE_HOUR
+        self._seed(db_session, tenant_id, "extractions_per_hour", 75, 75, old_window_start)
+        
+        allowed = rate_limit_service.check_and_increment(tenant_id, "extractions_per_hour", 75)
+        
+        rate_limit = self._get(db_session, tenant_id, "extractions_per_hour")
+        assert allowed is True, "Request after the window expired should be allowed"
+        assert rate_limit.current_usage == 1, "Usage should restart in the new window"
+        assert rate_limit.limit_value == 75, "Reset should keep the configured limit"
+        # SQLite returns naive UTC datetimes, so compare without tzinfo
+        assert rate_limit.window_start.replace(tzinfo=None) > old_window_start.replace(tzinfo=None), \
+            "Window should move forward"
+        assert rate_limit.window_end - rate_limit.window_start == _ONE_HOUR
+    
+    @pytest.mark.parametrize("limit_type,limit,over_limit", _LIMIT_CASES)
+    def test_exactly_limit_requests_are_allowed_per_window(
+        self, db_session, rate_limit_service, limit_type, limit, over_limit
+    ):
+        """Test that exactly limit requests are allowed in one window and the rest are blocked"""
+        tenant_id = fake_uuid()
+        
+        results = [
+            rate_limit_service.check_and_increment(tenant_id, limit_type, limit)
+            for _ in range(limit + over_limit)
+        ]
+        
+        assert results == [True] * limit + [False] * over_limit, \
+            f"Expected {limit} allowed and {over_limit} blocked requests"
+        assert self._get(db_session, tenant_id, limit_type).current_usage == limit, \
+            "Blocked requests should not be counted"
+    
+    def test_very_high_limit_is_enforced(self, db_session, rate_limit_service):
+        """Test that a very high configured limit is stored and enforced, not capped at 1000"""
+        tenant_id = fake_uuid()
+        high_limit = 1000000
+        self._seed(db_session, tenant_id, "api_requests_per_hour", high_limit, high_limit - 1,
+                   datetime.now(timezone.utc))
+        
+        assert rate_limit_service.check_and_increment(tenant_id, "api_requests_per_hour", high_limit) is True
+        assert rate_limit_service.check_and_increment(tenant_id, "api_requests_per_hour", high_limit) is False
+        
+        rate_limit = self._get(db_session, tenant_id, "api_requests_per_hour")
+        assert rate_limit.limit_value == high_limit, "Should keep the very high configured limit"
+        assert rate_limit.current_usage == high_limit
+    
+    def test_tenants_and_limit_types_are_counted_separately(self, rate_limit_service):
+        """Test that each (tenant, limit type) pair has its own counter"""
+        tenant1_id, tenant2_id = fake_uuid(), fake_uuid()
+        
+        assert rate_limit_service.check_and_increment(tenant1_id, "api_requests_per_minute", 1)
+        assert not rate_limit_service.check_and_increment(tenant1_id, "api_requests_per_minute", 1)
+        assert rate_limit_service.check_and_increment(tenant1_id, "extractions_per_hour", 1), \
+            "Other limit types should have their own counter"
+        assert rate_limit_service.check_and_increment(tenant2_id, "api_requests_per_minute", 1), \
+            "Other tenants should have their own counter"
+    
+    def test_unsupported_dialect_is_rejected(self, db_session, rate_limit_service):
+        """Test that backends without an ON CONFLICT upsert fail clearly instead of misbehaving"""
+        with patch.object(db_session.get_bind().dialect, "name", "mysql"):
+            with pytest.raises(ValueError, match="mysql"):
+                rate_limit_service.check_and_increment(fake_uuid(), "api_requests_per_minute", 1)
         
+        assert db_session.query(TenantRateLimit).count() == 0
+
+
+class TestRateLimitServiceIntegration:
+    """
+    Integration tests that use real RateLimitService with in-memory SQLite database.
+    These tests verify the actual implementation behavior, not just mocks.
+    """
+    
+    _MODELS = (Tenant, TenantConfiguration, TenantRateLimit)
+    
+    @pytest.fixture(scope="session")
+    def engine(self):
+        """Create an in-memory SQLite database once per test session"""
         # Create in-memory SQLite engine
         engine = create_engine(
             "sqlite:///:memory:",
@@ -528,26 +734,69 @@ class TestRateLimitServiceIntegration:
             poolclass=StaticPool,
         )
         
-        # Create all tables
-        Base.metadata.create_all(bind=engine)
+        # Skip journaling/sync work the throwaway database never needs.
+        # WAL cannot be enabled on an in-memory database, so use an in-memory journal instead.
+        # pysqlite's own transaction handling breaks SAVEPOINTs, so emit BEGIN ourselves.
+        @event.listens_for(engine, "connect")
+        def set_sqlite_pragmas(dbapi_connection, connection_record):
+            dbapi_connection.isolation_level = None
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA journal_mode=MEMORY")
+            cursor.execute("PRAGMA synchronous=OFF")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+            cursor.execute("PRAGMA cache_size=-64000")
+            cursor.close()
+        
+        @event.listens_for(engine, "begin")
+        def do_begin(connection):
+            connection.exec_driver_sql("BEGIN")
+        
+        # Create the tables these tests use, in a form SQLite can build
+        metadata = _sqlite_metadata(*self._MODELS)
+        metadata.create_all(bind=engine)
+        for model in self._MODELS:
+            event.listen(model, "load", _restore_utc)
+            event.listen(model, "refresh", _restore_utc)
+        
+        yield engine
         
-        # Create session
-        TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        # Cleanup
+        for model in self._MODELS:
+            event.remove(model, "load", _restore_utc)
+            event.remove(model, "refresh", _restore_utc)
+        metadata.drop_all(bind=engine)
+        engine.dispose()
+    
+    @pytest.fixture
+    def db_session(self, engine):
+        """Create a session whose work is rolled back after each test"""
+        connection = engine.connect()
+        transaction = connection.begin()
+        
+        # Service commits release a SAVEPOINT instead of committing the outer transaction.
+        # The services share this session, so no autoflush and no reload of every
+        # object after each of their commits.
+        TestingSessionLocal = sessionmaker(
+            autocommit=False,
+            autoflush=False,
+            expire_on_commit=False,
+            bind=connection,
+            join_transaction_mode="create_savepoint"
+        )
         session = TestingSessionLocal()
         
         yield session
         
         # Cleanup
         session.close()
-        Base.metadata.drop_all(bind=engine)
+        transaction.rollback()
+        connection.close()
     
     @pytest.fixture
     def test_tenant(self, db_session: Session):
         """Create a test tenant"""
-        from src.models.database import Tenant
-        
         tenant = Tenant(
-            id=uuid.uuid4(),
+            id=fake_uuid(),
             name="Test Tenant",
             slug="test-tenant",
             settings={},
@@ -556,17 +805,14 @@ class TestRateLimitServiceIntegration:
         )
         db_session.add(tenant)
         db_session.commit()
-        db_session.refresh(tenant)
         
         return tenant
     
     @pytest.fixture
     def rate_limits_config(self, db_session: Session, test_tenant):
         """Create tenant rate limits configuration with custom values"""
-        from src.models.database import TenantConfiguration
-        
         config = TenantConfiguration(
-            id=uuid.uuid4(),
+            id=fake_uuid(),
             tenant_id=test_tenant.id,
             config_type="rate_limits",
             config_data={
@@ -582,149 +828,106 @@ class TestRateLimitServiceIntegration:
         )
         db_session.add(config)
         db_session.commit()
-        db_session.refresh(config)
         
         return config
     
     @pytest.fixture
     def rate_limit_service(self, db_session: Session):
         """Create RateLimitService instance with test database"""
-        from src.services.tenant_config_service import RateLimitService
-        
         return RateLimitService(db_session)
     
     @pytest.fixture
     def tenant_config_service(self, db_session: Session):
         """Create TenantConfigService instance with test database"""
-        from src.services.tenant_config_service import TenantConfigService
-        
         return TenantConfigService(db_session)
     
-    def test_increment_creates_rate_limit_with_configured_value(
-        self, 
-        db_session: Session,
-        test_tenant,
-        rate_limits_config,
-        rate_limit_service,
-        tenant_config_service
-    ):
-        """
-        Integration test: Verify increment_rate_limit creates new record
-        with actual tenant-configured limit value, not hardcoded 1000.
-        """
-        from src.models.database import TenantRateLimit
-        
-        # Get the configured limit value for this tenant
-        config = tenant_config_service.get_rate_limits_config(test_tenant.id)
-        assert config is not None, "Rate limits config should exist"
-        assert config.api_requests_per_minute == 250, "Custom config should be loaded"
-        
-        # Call increment_rate_limit with configured value
-        rate_limit_service.increment_rate_limit(
-            tenant_id=test_tenant.id,
-            limit_type="api_requests_per_minute",
-            limit_value=config.api_requests_per_minute
-        )
-        
-        # Verify the record was created with correct limit_value
-        rate_limit = db_session.query(TenantRateLimit).filter(
-            TenantRateLimit.tenant_id == test_tenant.id,
-            TenantRateLimit.limit_type == "api_requests_per_minute"
-        ).first()
-        
-        assert rate_limit is not None, "Rate limit record should be created"
-        assert rate_limit.limit_value == 250, "Should use configured limit (250), not hardcoded 1000"
-        assert rate_limit.limit_value != 1000, "Should NOT use hardcoded value"
-        assert rate_limit.current_usage == 1, "Current usage should be 1 after first increment"
-        assert rate_limit.window_start is not None, "Window start should be set"
-        assert rate_limit.window_end is not None, "Window end should be set"
-    
-    def test_increment_preserves_limit_value_on_subsequent_calls(
+    def test_rate_limits_config_lookup_is_memoized(
         self,
         db_session: Session,
         test_tenant,
         rate_limits_config,
-        rate_limit_service,
         tenant_config_service
     ):
         """
-        Integration test: Verify that incrementing existing record
-        preserves the original limit_value.
+        Integration test: Verify repeated rate limits config lookups hit the
+        database once and that writes invalidate the memoized value.
         """
-        from src.models.database import TenantRateLimit
-        
-        config = tenant_config_service.get_rate_limits_config(test_tenant.id)
-        configured_limit = config.extractions_per_hour
+        with patch.object(db_session, "query", wraps=db_session.query) as query:
+            first = tenant_config_service.get_rate_limits_config(test_tenant.id)
+            second = tenant_config_service.get_rate_limits_config(test_tenant.id)
         
-        # Create initial record
-        rate_limit_service.increment_rate_limit(
-            tenant_id=test_tenant.id,
-            limit_type="extractions_per_hour",
-            limit_value=configured_limit
-        )
+        assert first == second, "Memoized config should match the first lookup"
+        assert query.call_count == 1, "Repeated lookups should not re-query TenantConfiguration"
         
-        # Increment again
-        rate_limit_service.increment_rate_limit(
+        # Updating the configuration must not return the stale memoized value
+        tenant_config_service.create_or_update_config(
             tenant_id=test_tenant.id,
-            limit_type="extractions_per_hour",
-            limit_value=configured_limit
+            config_type="rate_limits",
+            config_data={**rate_limits_config.config_data, "api_requests_per_minute": 300}
         )
+        config = tenant_config_service.get_rate_limits_config(test_tenant.id)
+        assert config.api_requests_per_minute == 300, "Writes should invalidate the memo"
         
-        # Verify limit_value is preserved
-        rate_limit = db_session.query(TenantRateLimit).filter(
-            TenantRateLimit.tenant_id == test_tenant.id,
-            TenantRateLimit.limit_type == "extractions_per_hour"
-        ).first()
-        
-        assert rate_limit.limit_value == configured_limit, "Limit value should be preserved"
-        assert rate_limit.current_usage == 2, "Usage should increment to 2"
+        # Deleting the configuration must not keep serving the memoized value either
+        assert tenant_config_service.delete_config(test_tenant.id, "rate_limits") is True
+        assert tenant_config_service.get_rate_limits_config(test_tenant.id) is None, \
+            "Deletes should invalidate the memo"
     
-    def test_check_rate_limit_compares_against_configured_value(
+    @pytest.mark.parametrize("limit_type,increments,expected_allowed", [
+        ("api_requests_per_minute", 1, True),       # First increment creates the record
+        ("extractions_per_hour", 2, True),          # Subsequent increments preserve the limit
+        ("document_uploads_per_hour", 90, True),    # 90 < 100 is allowed
+        ("document_uploads_per_hour", 100, False),  # 100 >= 100 is blocked
+    ])
+    def test_increment_and_check_use_configured_value(
         self,
         db_session: Session,
         test_tenant,
         rate_limits_config,
         rate_limit_service,
-        tenant_config_service
+        tenant_config_service,
+        limit_type,
+        increments,
+        expected_allowed
     ):
         """
-        Integration test: Verify check_rate_limit uses the configured
-        limit value for comparison, not a hardcoded value.
+        Integration test: Verify increment_rate_limit creates the record with the
+        actual tenant-configured limit value (not hardcoded 1000), preserves it on
+        subsequent calls, and that check_rate_limit compares against it.
         """
+        # Get the configured limit value for this tenant
         config = tenant_config_service.get_rate_limits_config(test_tenant.id)
-        configured_limit = config.document_uploads_per_hour  # 100
+        assert config is not None, "Rate limits config should exist"
+        configured_limit = getattr(config, limit_type)
+        assert configured_limit == rate_limits_config.config_data[limit_type], "Custom config should be loaded"
         
-        # Create rate limit record at 90% usage
-        for _ in range(90):
+        for _ in range(increments):
             rate_limit_service.increment_rate_limit(
                 tenant_id=test_tenant.id,
-                limit_type="document_uploads_per_hour",
+                limit_type=limit_type,
                 limit_value=configured_limit
             )
         
-        # Should allow more requests (90 < 100)
-        is_allowed = rate_limit_service.check_rate_limit(
-            tenant_id=test_tenant.id,
-            limit_type="document_uploads_per_hour",
-            limit_value=configured_limit
-        )
-        assert is_allowed is True, "Should allow requests below configured limit"
+        # Verify the record was created with correct limit_value
+        rate_limit = db_session.query(TenantRateLimit).filter(
+            TenantRateLimit.tenant_id == test_tenant.id,
+            TenantRateLimit.limit_type == limit_type
+        ).first()
         
-        # Increment to exactly the limit
-        for _ in range(10):
-            rate_limit_service.increment_rate_limit(
-                tenant_id=test_tenant.id,
-                limit_type="document_uploads_per_hour",
-                limit_value=configured_limit
-            )
+        assert rate_limit is not None, "Rate limit record should be created"
+        assert rate_limit.limit_value == configured_limit, "Should use and preserve the configured limit"
+        assert rate_limit.limit_value != 1000, "Should NOT use hardcoded value"
+        assert rate_limit.current_usage == increments, f"Usage should be {increments} after {increments} increments"
+        assert rate_limit.window_start is not None, "Window start should be set"
+        assert rate_limit.window_end is not None, "Window end should be set"
         
-        # Should not allow more requests (100 >= 100)
         is_allowed = rate_limit_service.check_rate_limit(
             tenant_id=test_tenant.id,
-            limit_type="document_uploads_per_hour",
+            limit_type=limit_type,
             limit_value=configured_limit
         )
-        assert is_allowed is False, "Should block requests at configured limit"
+        assert is_allowed is expected_allowed, \
+            f"check_rate_limit should return {expected_allowed} at {increments}/{configured_limit}"
     
     def test_multiple_tenants_with_different_configured_limits(
         self,
@@ -735,46 +938,36 @@ class TestRateLimitServiceIntegration:
         Integration test: Verify different tenants can have different
         configured rate limits stored correctly.
         """
-        from src.models.database import Tenant, TenantConfiguration, TenantRateLimit
-        
-        # Create two tenants with different rate limits
-        tenant1 = Tenant(
-            id=uuid.uuid4(),
-            name="High Volume Tenant",
-            slug="high-volume",
-            status="active"
-        )
-        tenant2 = Tenant(
-            id=uuid.uuid4(),
-            name="Low Volume Tenant",
-            slug="low-volume",
-            status="active"
-        )
-        db_session.add_all([tenant1, tenant2])
-        db_session.commit()
+        # Create two tenants with different rate limits in one INSERT
+        tenant1_id = fake_uuid()
+        tenant2_id = fake_uuid()
+        db_session.connection().execute(insert(Tenant), [
+            {"id": tenant1_id, "name": "High Volume Tenant", "slug": "high-volume", "status": "active"},
+            {"id": tenant2_id, "name": "Low Volume Tenant", "slug": "low-volume", "status": "active"},
+        ])
         
         # Tenant 1: High limit (500)
         rate_limit_service.increment_rate_limit(
-            tenant_id=tenant1.id,
+            tenant_id=tenant1_id,
             limit_type="api_requests_per_minute",
             limit_value=500
         )
         
         # Tenant 2: Low limit (50)
         rate_limit_service.increment_rate_limit(
-            tenant_id=tenant2.id,
+            tenant_id=tenant2_id,
             limit_type="api_requests_per_minute",
             limit_value=50
         )
         
         # Verify each tenant has their own limit stored
         rate_limit1 = db_session.query(TenantRateLimit).filter(
-            TenantRateLimit.tenant_id == tenant1.id,
+            TenantRateLimit.tenant_id == tenant1_id,
             TenantRateLimit.limit_type == "api_requests_per_minute"
         ).first()
         
         rate_limit2 = db_session.query(TenantRateLimit).filter(
-            TenantRateLimit.tenant_id == tenant2.id,
+            TenantRateLimit.tenant_id == tenant2_id,
             TenantRateLimit.limit_type == "api_requests_per_minute"
         ).first()
         
@@ -798,8 +991,6 @@ class TestRateLimitServiceIntegration:
         Integration test: Verify that when rate limit window resets,
         the limit_value is preserved while current_usage resets to 0.
         """
-        from src.models.database import TenantRateLimit
-        
         config = tenant_config_service.get_rate_limits_config(test_tenant.id)
         configured_limit = config.api_requests_per_hour  # 5000
         
@@ -893,8 +1084,6 @@ class TestRateLimitServiceIntegration:
         Integration test: Verify reset_rate_limits resets usage counts
         but preserves limit_value for all rate limit types.
         """
-        from src.models.database import TenantRateLimit
-        
         config = tenant_config_service.get_rate_limits_config(test_tenant.id)
         
         # Create multiple rate limit records with usage
@@ -904,29 +1093,40 @@ class TestRateLimitServiceIntegration:
             ("extractions_per_hour", config.extractions_per_hour)
         ]
         
-        for limit_type, limit_value in limit_types:
-            for _ in range(10):  # Add some usage
-                rate_limit_service.increment_rate_limit(
-                    tenant_id=test_tenant.id,
-                    limit_type=limit_type,
-                    limit_value=limit_value
-                )
+        # Seed all three counters with some usage in one multi-row INSERT
+        now = datetime.now(timezone.utc)
+        db_session.connection().execute(insert(TenantRateLimit), [
+            {
+                "tenant_id": test_tenant.id,
+                "limit_type": limit_type,
+                "limit_value": limit_value,
+                "current_usage": 10,
+                "window_start": now,
+                "window_end": now + timedelta(hours=1)
+            }
+            for limit_type, limit_value in limit_types
+        ])
+        db_session.commit()
         
         # Reset all rate limits
         success = rate_limit_service.reset_rate_limits(test_tenant.id)
         assert success is True, "Reset should succeed"
         
-        # Verify all rate limits reset usage but preserved limit_value
-        for limit_type, limit_value in limit_types:
-            rate_limit = db_session.query(TenantRateLimit).filter(
-                TenantRateLimit.tenant_id == test_tenant.id,
-                TenantRateLimit.limit_type == limit_type
-            ).first()
-            
-            assert rate_limit.current_usage == 0, f"{limit_type}: usage should reset to 0"
-            assert rate_limit.limit_value == limit_value, f"{limit_type}: limit_value should be preserved"
-            assert rate_limit.window_start is not None, f"{limit_type}: window_start should be updated"
-            assert rate_limit.window_end is not None, f"{limit_type}: window_end should be updated"
+        # Verify all rate limits reset usage but preserved limit_value, fetching every row at once
+        rows = db_session.query(
+            TenantRateLimit.limit_type,
+            TenantRateLimit.current_usage,
+            TenantRateLimit.limit_value,
+            TenantRateLimit.window_start,
+            TenantRateLimit.window_end
+        ).filter(TenantRateLimit.tenant_id == test_tenant.id).all()
+        
+        actual = {
+            row.limit_type: (row.current_usage, row.limit_value, row.window_start is not None, row.window_end is not None)
+            for row in rows
+        }
+        expected = {limit_type: (0, limit_value, True, True) for limit_type, limit_value in limit_types}
+        assert actual == expected, "Usage should reset to 0 with limit_value and window preserved"
     
     def test_end_to_end_rate_limit_workflow(
         self,
@@ -947,22 +1147,17 @@ class TestRateLimitServiceIntegration:
         configured_limit = config.api_requests_per_minute  # 250
         limit_type = "api_requests_per_minute"
         
-        # 2. Simulate multiple API requests
-        for request_num in range(1, 245):  # Use 244 of 250 limit
-            # Check if allowed
-            is_allowed = rate_limit_service.check_rate_limit(
-                tenant_id=test_tenant.id,
-                limit_type=limit_type,
-                limit_value=configured_limit
-            )
-            assert is_allowed is True, f"Request {request_num} should be allowed"
-            
-            # Increment counter
-            rate_limit_service.increment_rate_limit(
-                tenant_id=test_tenant.id,
-                limit_type=limit_type,
-                limit_value=configured_limit
-            )
+        # 2. Seed the counter as if 244 of 250 requests were already made
+        now = datetime.now(timezone.utc)
+        db_session.connection().execute(insert(TenantRateLimit).values(
+            tenant_id=test_tenant.id,
+            limit_type=limit_type,
+            limit_value=configured_limit,
+            current_usage=244,
+            window_start=now,
+            window_end=now + timedelta(minutes=1)
+        ))
+        db_session.commit()
         
         # 3. Get current status
         status = rate_limit_service.get_rate_limit_status(
@@ -974,26 +1169,26 @@ class TestRateLimitServiceIntegration:
         assert status.limit_value == 250, "Limit should be configured value"
         
         # 4. Use remaining requests up to limit
-        for _ in range(6):  # Use last 6 requests (244 + 6 = 250)
-            is_allowed = rate_limit_service.check_rate_limit(
+        for request_num in range(245, 251):  # Use last 6 requests (244 + 6 = 250)
+            is_allowed = rate_limit_service.check_and_increment(
                 tenant_id=test_tenant.id,
                 limit_type=limit_type,
                 limit_value=configured_limit
             )
-            if is_allowed:
-                rate_limit_service.increment_rate_limit(
-                    tenant_id=test_tenant.id,
-                    limit_type=limit_type,
-                    limit_value=configured_limit
-                )
-        
-        # 5. Verify limit is reached
-        is_allowed = rate_limit_service.check_rate_limit(
+            assert is_allowed is True, f"Request {request_num} should be allowed"
+        
+        # 5. Verify limit is reached and blocked requests are not counted
+        is_allowed = rate_limit_service.check_and_increment(
             tenant_id=test_tenant.id,
             limit_type=limit_type,
             limit_value=configured_limit
         )
         assert is_allowed is False, "Should be blocked at limit"
+        assert rate_limit_service.check_rate_limit(
+            tenant_id=test_tenant.id,
+            limit_type=limit_type,
+            limit_value=configured_limit
+        ) is False, "check_rate_limit should agree with check_and_increment"
         
         # 6. Get final status
         final_status = rate_limit_service.get_rate_limit_status(
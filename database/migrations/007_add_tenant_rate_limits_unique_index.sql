@@ -0,0 +1,21 @@
+-- Migration: Add unique (tenant_id, limit_type) index to tenant_rate_limits
+-- Description: Enforces one counter row per tenant and limit type (matching the
+-- unique_tenant_limit_type constraint on the model) so rate limit checks can use
+-- INSERT ... ON CONFLICT (tenant_id, limit_type) DO UPDATE
+
+-- Remove duplicate counters, keeping the most recently updated row
+DELETE FROM tenant_rate_limits
+WHERE id IN (
+    SELECT id FROM (
+        SELECT id, ROW_NUMBER() OVER (
+            PARTITION BY tenant_id, limit_type
+            ORDER BY updated_at DESC NULLS LAST, id
+        ) AS row_num
+        FROM tenant_rate_limits
+    ) ranked
+    WHERE ranked.row_num > 1
+);
+
+-- Add unique index backing the ON CONFLICT target
+CREATE UNIQUE INDEX IF NOT EXISTS unique_tenant_limit_type
+ON tenant_rate_limits(tenant_id, limit_type);
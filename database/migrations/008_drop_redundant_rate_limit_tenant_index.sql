@@ -0,0 +1,6 @@
+-- Migration: Drop redundant tenant_id index on tenant_rate_limits
+-- Description: The unique (tenant_id, limit_type) index added in 007 already serves
+-- tenant_id lookups through its leading column, so the single-column index only
+-- adds write overhead to every rate limit increment
+
+DROP INDEX IF EXISTS idx_tenant_rate_limits_tenant_id;
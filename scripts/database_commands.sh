@@ -30,16 +30,14 @@ show_db_status() {
     echo "📊 Database Status for: $db_name"
     echo "================================"
     
-    echo "Users:"
-    db_query "SELECT email, role, status FROM users;"
-    
-    echo ""
-    echo "Tenants:"
-    db_query "SELECT id, name, status FROM tenants;"
-    
-    echo ""
-    echo "Database Size:"
-    db_query "SELECT pg_size_pretty(pg_database_size('$db_name'));"
+    # Resolve the database once and run all status queries in a single psql session
+    docker-compose exec db psql -U postgres -d "$db_name" \
+        -c "\\echo Users:" \
+        -c "SELECT email, role, status FROM users;" \
+        -c "\\echo Tenants:" \
+        -c "SELECT id, name, status FROM tenants;" \
+        -c "\\echo Database Size:" \
+        -c "SELECT pg_size_pretty(pg_database_size('$db_name'));"
 }
 
 # Main function
@@ -4,8 +4,10 @@ Permission System Test Script
 Tests the enhanced permission system with tenant scoping
 """
 
+import functools
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from uuid import UUID
 
 # Configuration
@@ -13,12 +15,25 @@ BASE_URL = "http://localhost:8000"
 # Use the default tenant ID from constants
 TEST_TENANT_ID = "00000000-0000-0000-0000-000000000001"  # TODO: Import from backend constants
 
+# Shared session so all requests reuse pooled keep-alive connections
+SESSION = requests.Session()
+
+# (connect, read) timeouts in seconds, so a down or stuck backend fails fast
+TIMEOUT = (1.0, 10.0)
+
+# Independent endpoints checked for every role, in report order
+ENDPOINTS = (("Documents", "/api/documents"), ("Users", "/api/users"))
+
+# Status codes that count as access granted
+ALLOWED_STATUSES = frozenset({200})
+
+@functools.lru_cache(maxsize=None)
 def login_user(email, password):
-    """Login and get access token"""
-    response = requests.post(f"{BASE_URL}/api/auth/login", json={
+    """Login and get access token (cached per credentials for the script run)"""
+    response = SESSION.post(f"{BASE_URL}/api/auth/login", json={
         "email": email,
         "password": password
-    })
+    }, timeout=TIMEOUT)
     
     if response.status_code == 200:
         data = response.json()
@@ -27,47 +42,56 @@ def login_user(email, password):
         print(f"Login failed for {email}: {response.text}")
         return None, None
 
+def fetch_endpoints(endpoints):
+    """GET independent endpoints concurrently and return their status codes by name"""
+    with ThreadPoolExecutor(max_workers=len(endpoints)) as executor:
+        futures = {executor.submit(SESSION.get, f"{BASE_URL}{path}", timeout=TIMEOUT): name for name, path in endpoints}
+        return {futures[future]: future.result().status_code for future in as_completed(futures)}
+
+def backend_is_up():
+    """Check the health endpoint so later checks are skipped when the backend is unreachable"""
+    try:
+        return SESSION.get(f"{BASE_URL}/health/", timeout=TIMEOUT).status_code == 200
+    except requests.exceptions.RequestException as e:
+        print(f"❌ Backend not reachable at {BASE_URL}: {e}")
+        return False
+
+def check_role(email, password, denied_notes=None):
+    """Login as a user and report their access to each endpoint"""
+    denied_notes = denied_notes or {}
+    token, user = login_user(email, password)
+    if not token:
+        return
+    
+    print(f"   User: {user['email']}")
+    print(f"   Role: {user['role']}")
+    print(f"   Tenant: {user['tenant_id']}")
+    
+    SESSION.headers.update({"Authorization": f"Bearer {token}"})
+    statuses = fetch_endpoints(ENDPOINTS)
+    
+    for name, _ in ENDPOINTS:
+        status = statuses[name]
+        result = "✅" if status in ALLOWED_STATUSES else "❌" + denied_notes.get(name, "")
+        print(f"   {name} access: {status} {result}")
+
 def test_permissions():
     """Test permission system with different roles"""
     
     print("🔐 Testing Permission System")
     print("=" * 50)
     
-    # Test with tenant admin
-    print("\n1. Testing Tenant Admin Permissions:")
-    token, user = login_user("admin@docextract.com", "admin123")
+    if not backend_is_up():
+        print("\n⏩ Skipping permission checks")
+        return
     
-    if token:
-        print(f"   User: {user['email']}")
-        print(f"   Role: {user['role']}")
-        print(f"   Tenant: {user['tenant_id']}")
-        
-        # Test documents access (should work)
-        headers = {"Authorization": f"Bearer {token}"}
-        response = requests.get(f"{BASE_URL}/api/documents", headers=headers)
-        print(f"   Documents access: {response.status_code} {'✅' if response.status_code == 200 else '❌'}")
-        
-        # Test users access (should work for tenant admin)
-        response = requests.get(f"{BASE_URL}/api/users", headers=headers)
-        print(f"   Users access: {response.status_code} {'✅' if response.status_code == 200 else '❌'}")
+    # Test with tenant admin (documents and users should both work)
+    print("\n1. Testing Tenant Admin Permissions:")
+    check_role("admin@docextract.com", "admin123")
     
-    # Test with regular user
+    # Test with regular user (users access should fail)
     print("\n2. Testing Regular User Permissions:")
-    token, user = login_user("user@docextract.com", "admin123")
-    
-    if token:
-        print(f"   User: {user['email']}")
-        print(f"   Role: {user['role']}")
-        print(f"   Tenant: {user['tenant_id']}")
-        
-        # Test documents access (should work)
-        headers = {"Authorization": f"Bearer {token}"}
-        response = requests.get(f"{BASE_URL}/api/documents", headers=headers)
-        print(f"   Documents access: {response.status_code} {'✅' if response.status_code == 200 else '❌'}")
-        
-        # Test users access (should fail for regular user)
-        response = requests.get(f"{BASE_URL}/api/users", headers=headers)
-        print(f"   Users access: {response.status_code} {'✅' if response.status_code == 200 else '❌ (Expected for user role)'}")
+    check_role("user@docextract.com", "admin123", denied_notes={"Users": " (Expected for user role)"})
     
     print("\n✅ Permission testing complete!")
 
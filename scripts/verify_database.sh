@@ -23,8 +23,10 @@ echo ""
 
 # 3. Verify the correct database has data
 echo "3. Database Content Verification:"
-echo "   Users count: $(docker-compose exec db psql -U postgres -d $DB_NAME -t -c "SELECT COUNT(*) FROM users;")"
-echo "   Tenants count: $(docker-compose exec db psql -U postgres -d $DB_NAME -t -c "SELECT COUNT(*) FROM tenants;")"
+# Fetch both counts in one psql session instead of one exec per count
+read -r USERS_COUNT TENANTS_COUNT <<< "$(docker-compose exec -T db psql -U postgres -d $DB_NAME -AtX -F ' ' -c "SELECT (SELECT COUNT(*) FROM users), (SELECT COUNT(*) FROM tenants);")"
+echo "   Users count: $USERS_COUNT"
+echo "   Tenants count: $TENANTS_COUNT"
 echo ""
 
 # 4. Show sample data